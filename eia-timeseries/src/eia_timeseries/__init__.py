@@ -1,5 +1,6 @@
 from .data_collector import EnergyWeatherCollector
 from .analyzer import EnergyWeatherAnalyzer
+from .chunked import ChunkedAnalyzer
 from .config import REGIONS, get_date_range
 
 def main() -> None:
@@ -1,36 +1,131 @@
 # src/eia_timeseries/analyzer.py
 import pandas as pd
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from .rollups import DEFAULT_COLUMNS, RollupStore, aggregate_frame, slice_hours, summarize
+from .sketches import DemandSketches, DEFAULT_QUANTILES
+
+NUMERIC_CANDIDATES = ['value', 'temperature_2m', 'relative_humidity_2m',
+                      'wind_speed_10m', 'shortwave_radiation']
 
 class EnergyWeatherAnalyzer:
     """Analyzes correlations between energy demand and weather patterns"""
     
-    def __init__(self, data: pd.DataFrame):
+    def __init__(self, data: pd.DataFrame, rollups: Optional[RollupStore] = None,
+                 sketches: Optional[DemandSketches] = None):
         self.data = data.copy()
         self.analysis_results = {}
+        self.rollups = rollups
+        self.sketches = sketches
         self._prepare_data()
+        
+        # An injected store or sketch may have been built from only part of this
+        # data; update() skips hours it already holds, so folding the rest in is safe
+        if self.rollups is not None:
+            self.rollups.update(self.data)
+        if self.sketches is not None:
+            self.sketches.update(self.data)
     
-    def _prepare_data(self):
-        """Prepare data for analysis by handling data types"""
+    @staticmethod
+    def _prepare_frame(data: pd.DataFrame) -> pd.DataFrame:
+        """Coerce timestamp and numeric columns and drop rows with no numeric values"""
         # Convert timestamp to datetime if not already
-        if 'timestamp' in self.data.columns:
-            self.data['timestamp'] = pd.to_datetime(self.data['timestamp'])
+        if 'timestamp' in data.columns:
+            data['timestamp'] = pd.to_datetime(data['timestamp'])
         
         # Ensure numeric columns are properly typed
-        numeric_candidates = ['value', 'temperature_2m', 'relative_humidity_2m', 
-                            'wind_speed_10m', 'shortwave_radiation']
-        
-        for col in numeric_candidates:
-            if col in self.data.columns:
-                self.data[col] = pd.to_numeric(self.data[col], errors='coerce')
+        for col in NUMERIC_CANDIDATES:
+            if col in data.columns:
+                data[col] = pd.to_numeric(data[col], errors='coerce')
         
         # Remove rows with all NaN values in numeric columns
+        numeric_cols = data.select_dtypes(include=[np.number]).columns
+        return data.dropna(subset=numeric_cols, how='all')
+    
+    def _prepare_data(self):
+        """Prepare data for analysis by handling data types"""
+        self.data = self._prepare_frame(self.data)
         numeric_cols = self.data.select_dtypes(include=[np.number]).columns
-        self.data = self.data.dropna(subset=numeric_cols, how='all')
         
         print(f"Data prepared: {len(self.data)} rows, {len(numeric_cols)} numeric columns")
     
+    def _new_hours(self, new_data: pd.DataFrame) -> pd.DataFrame:
+        """Keep only hours later than the latest hour already held for their region
+        
+        Rollups are append-only, so late, backfilled or revised hours are
+        rejected here rather than letting the hourly data and rollups diverge.
+        """
+        if 'timestamp' not in new_data.columns:
+            return new_data
+        
+        keys = [col for col in ('region_key', 'timestamp') if col in new_data.columns]
+        new_data = new_data.drop_duplicates(subset=keys, keep='last')
+        if self.data.empty or 'timestamp' not in self.data.columns:
+            return new_data
+        
+        def regions(frame):
+            if 'region_key' in frame.columns:
+                return frame['region_key']
+            return pd.Series('all', index=frame.index)
+        
+        latest = pd.to_datetime(self.data['timestamp'], utc=True).groupby(regions(self.data)).max()
+        watermark = regions(new_data).map(latest)
+        fresh = watermark.isna() | (pd.to_datetime(new_data['timestamp'], utc=True) > watermark)
+        
+        rejected = int((~fresh).sum())
+        if rejected:
+            print(f"Skipped {rejected} rows at or before the latest ingested hour of their region")
+        return new_data[fresh]
+    
+    def ingest(self, new_data: pd.DataFrame) -> int:
+        """Append newly collected hours and fold them into the rollups and sketches if they exist
+        
+        Returns the number of hourly rows accepted.
+        """
+        new_data = self._prepare_frame(new_data.copy())
+        fresh = self._new_hours(new_data)
+        self.data = pd.concat([self.data, fresh], ignore_index=True)
+        
+        if self.sketches is not None:
+            self.sketches.update(fresh)
+        if self.rollups is not None:
+            self.rollups.update(fresh)
+        return len(fresh)
+    
+    def rollup(self, freq: str = 'M', start=None, end=None) -> pd.DataFrame:
+        """
+        Aggregate demand and weather per region into daily/weekly/monthly/quarterly/yearly buckets
+        
+        Served from the smallest precomputed rollup that exactly covers the
+        query; falls back to the hourly data when start/end split a bucket.
+        """
+        if self.rollups is None:
+            self.rollups = RollupStore()
+            self.rollups.update(self.data)
+        
+        result = self.rollups.query(freq, start, end)
+        if result is not None:
+            return result
+        
+        columns = self.rollups.columns or [col for col in DEFAULT_COLUMNS if col in self.data.columns]
+        hourly = slice_hours(self.data, start, end)
+        agg = aggregate_frame(hourly, freq, columns, self.rollups.demand_col)
+        return summarize(agg, columns, self.rollups.demand_col)
+    
+    def _demand_sketches(self) -> DemandSketches:
+        """Build the quantile sketches in one streaming pass on first use"""
+        if self.sketches is None:
+            self.sketches = DemandSketches().update(self.data)
+        return self.sketches
+    
+    def demand_percentiles(self, by: str = 'all', quantiles=DEFAULT_QUANTILES) -> pd.DataFrame:
+        """Approximate demand percentiles per region, overall or by 'hour', 'month' or 'temp_band'"""
+        return self._demand_sketches().percentiles(by, quantiles)
+    
+    def hottest_hour_demand(self, temp_quantile: float = 0.95, quantiles=DEFAULT_QUANTILES) -> pd.DataFrame:
+        """Approximate demand percentiles over each region's hottest hours"""
+        return self._demand_sketches().hottest_hours(temp_quantile, quantiles)
+    
     def basic_stats(self) -> Dict[str, Any]:
         """Calculate basic statistics for energy and weather variables"""
         numeric_cols = self.data.select_dtypes(include=[np.number]).columns
@@ -103,6 +198,111 @@ class EnergyWeatherAnalyzer:
         except Exception as e:
             return {'error': f'Error calculating hourly patterns: {str(e)}'}
     
+    def temperature_sensitivity(self, temp_col: str = 'temperature_2m') -> Dict[str, Any]:
+        """Fit a heating/cooling change-point model of demand on temperature per region
+
+        Demand is modelled as base + heating * max(Tb - T, 0) + cooling * max(T - Tb, 0).
+        Every distinct temperature between a region's 5th and 95th percentile is
+        scored as a balance point Tb, for all regions at once: rows are sorted by
+        (region, temperature) and cumulative sums of 1, T, T^2, y and T*y give the
+        normal equations for each split without refitting.
+        """
+        if 'value' not in self.data.columns or temp_col not in self.data.columns:
+            return {'error': f"Need 'value' and '{temp_col}' columns"}
+
+        try:
+            frame = pd.DataFrame({
+                'y': pd.to_numeric(self.data['value'], errors='coerce'),
+                't': pd.to_numeric(self.data[temp_col], errors='coerce'),
+                'region': self.data['region_key'] if 'region_key' in self.data.columns else 'all'
+            }).dropna()
+            if frame.empty:
+                return {'error': 'No overlapping demand and temperature values'}
+
+            region_codes, regions = pd.factorize(frame['region'], sort=True)
+            n_regions = len(regions)
+            order = np.lexsort((frame['t'].to_numpy(), region_codes))
+            codes = region_codes[order]
+            t = frame['t'].to_numpy(dtype=float)[order]
+            y = frame['y'].to_numpy(dtype=float)[order]
+
+            # Segment boundaries of each region in the sorted arrays
+            counts = np.bincount(codes, minlength=n_regions)
+            ends = np.cumsum(counts)
+            starts = ends - counts
+
+            # Cumulative sufficient statistics with a leading zero row
+            stats = np.column_stack([np.ones_like(t), t, t * t, y, t * y])
+            cum = np.vstack([np.zeros(5), np.cumsum(stats, axis=0)])
+
+            # Candidates are the first sorted row of each distinct temperature inside
+            # its region's 5th-95th percentile, so every row before it is strictly colder
+            rank = np.arange(len(t)) - starts[codes]
+            lower = np.maximum(np.floor(0.05 * counts), 1)[codes]
+            upper = np.ceil(0.95 * counts)[codes]
+            first = np.ones(len(t), dtype=bool)
+            first[1:] = (t[1:] != t[:-1]) | (codes[1:] != codes[:-1])
+            split = np.flatnonzero(first & (rank >= lower) & (rank < upper))
+            owner = codes[split]
+            tb = t[split]
+
+            below = cum[split] - cum[starts[owner]]
+            above = cum[ends[owner]] - cum[split]
+            n_b, st_b, stt_b, sy_b, sty_b = below.T
+            n_a, st_a, stt_a, sy_a, sty_a = above.T
+
+            # Heating degrees (Tb - T) below the split, cooling degrees (T - Tb) above it
+            sh = tb * n_b - st_b
+            shh = tb * tb * n_b - 2 * tb * st_b + stt_b
+            shy = tb * sy_b - sty_b
+            sc = st_a - tb * n_a
+            scc = stt_a - 2 * tb * st_a + tb * tb * n_a
+            scy = sty_a - tb * sy_a
+            n = n_b + n_a
+            sy = sy_b + sy_a
+
+            xtx = np.zeros(tb.shape + (3, 3))
+            xtx[:, 0, 0] = n
+            xtx[:, 0, 1] = xtx[:, 1, 0] = sh
+            xtx[:, 0, 2] = xtx[:, 2, 0] = sc
+            xtx[:, 1, 1] = shh
+            xtx[:, 2, 2] = scc
+            xty = np.stack([sy, shy, scy], axis=-1)
+
+            beta = np.einsum('kij,kj->ki', np.linalg.pinv(xtx), xty)
+            syy = np.add.reduceat(y * y, starts)
+            sse = syy[owner] - np.einsum('ki,ki->k', beta, xty)
+
+            # Lowest-error candidate of each region
+            ranked = np.lexsort((sse, owner))
+            leaders = ranked[np.r_[True, owner[ranked][1:] != owner[ranked][:-1]]]
+            best = dict(zip(owner[leaders], leaders))
+
+            sst = syy - (cum[ends, 3] - cum[starts, 3]) ** 2 / counts
+            results = {}
+            for r, region in enumerate(regions):
+                if r not in best:
+                    continue
+                k = best[r]
+                b = beta[k]
+                results[region] = {
+                    'balance_temp': round(float(tb[k]), 2),
+                    'base_load': round(float(b[0]), 2),
+                    'heating_slope': round(float(b[1]), 2),
+                    'cooling_slope': round(float(b[2]), 2),
+                    'r_squared': round(float(1 - sse[k] / sst[r]), 4) if sst[r] > 0 else float('nan'),
+                    'n': int(counts[r])
+                }
+
+            if not results:
+                return {'error': 'Not enough distinct temperatures to fit a balance point'}
+
+            self.analysis_results['temperature_sensitivity'] = results
+            return results
+
+        except Exception as e:
+            return {'error': f'Error fitting temperature sensitivity: {str(e)}'}
+
     def data_quality_check(self) -> Dict[str, Any]:
         """Check data quality and completeness"""
         quality_info = {
@@ -169,7 +369,18 @@ class EnergyWeatherAnalyzer:
                     report.append("")
         except Exception as e:
             report.append(f"Error in correlation analysis: {str(e)}\n")
-        
+
+        # Temperature sensitivity
+        sensitivity = self.temperature_sensitivity()
+        if 'error' not in sensitivity:
+            report.append("Temperature Sensitivity (change-point model):")
+            for region, fit in sensitivity.items():
+                report.append(f"  {region}: balance {fit['balance_temp']:.1f}°C, "
+                              f"heating {fit['heating_slope']:.2f} MW/°C, "
+                              f"cooling {fit['cooling_slope']:.2f} MW/°C, "
+                              f"R² {fit['r_squared']:.3f}")
+            report.append("")
+
         # Key insights
         try:
             report.append("Key Insights:")
@@ -195,6 +406,37 @@ class EnergyWeatherAnalyzer:
         except Exception as e:
             report.append(f"Error generating insights: {str(e)}")
         
+        # Demand percentiles
+        try:
+            percentiles = self.demand_percentiles()
+            if not percentiles.empty:
+                temp_quantile = 0.95
+                hottest = self.hottest_hour_demand(temp_quantile)
+                by_hour = self.demand_percentiles('hour')
+                by_month = self.demand_percentiles('month')
+                report.append("\nDemand Percentiles (P50 / P95 / P99):")
+                for (region, _), row in percentiles.iterrows():
+                    report.append(f"  {region}: {row['p50']:.2f} / {row['p95']:.2f} / {row['p99']:.2f}")
+                    for label, table, fmt in (('hour', by_hour, lambda h: f"{h:02d}:00"),
+                                              ('month', by_month, lambda m: pd.Timestamp(2000, m, 1).strftime('%b'))):
+                        if region not in table.index.get_level_values('region_key'):
+                            continue
+                        region_table = table.loc[region]
+                        for col in ('p95', 'p99'):
+                            peak = region_table[col].idxmax()
+                            report.append(f"  {region} peak {label} at {col.upper()}: {fmt(peak)} "
+                                          f"({region_table.loc[peak, col]:.2f})")
+                        report.append(f"  {region} P95 by {label}: " + ", ".join(
+                            f"{fmt(bucket)} {value:.0f}" for bucket, value in region_table['p95'].items()))
+                    if region in hottest.index:
+                        hot = hottest.loc[region]
+                        report.append(f"  {region} hours >= {hot['band_start']:.1f}°C "
+                                      f"(P{temp_quantile * 100:g} temperature {hot['temp_threshold']:.1f}°C, "
+                                      f"{hot['share']:.1%} of hours): "
+                                      f"{hot['p50']:.2f} / {hot['p95']:.2f} / {hot['p99']:.2f}")
+        except Exception as e:
+            report.append(f"Error computing demand percentiles: {str(e)}")
+        
         # Data quality summary
         report.append("\nData Quality:")
         missing_summary = []
@@ -0,0 +1,372 @@
+import io
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from functools import partial as bind
+from pathlib import Path
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
+from .analyzer import EnergyWeatherAnalyzer
+from .sketches import DemandSketches, TDigest, DEFAULT_QUANTILES
+
+WEATHER_KEYWORDS = ['temperature', 'humidity', 'wind', 'shortwave', 'radiation']
+
+def _common_dtype(a, b):
+    """Dtype a column read in separate chunks ends up with, as read_csv would infer it in one go"""
+    if a == b:
+        return a
+    numeric = [pd.api.types.is_numeric_dtype(d) and not pd.api.types.is_bool_dtype(d) for d in (a, b)]
+    if all(numeric):
+        try:
+            return np.result_type(a, b)
+        except TypeError:
+            pass
+    return np.dtype(object)
+
+def _read_row_group(path: str, index: int) -> pd.DataFrame:
+    """Read a single Parquet row group; each call opens its own file handle"""
+    import pyarrow.parquet as pq
+    return pq.ParquetFile(path).read_row_group(index).to_pandas()
+
+def _csv_ranges(path: str, chunk_rows: int) -> Tuple[bytes, List[Tuple[int, int]]]:
+    """Split a CSV into byte ranges of roughly ``chunk_rows`` lines, estimated from the first lines"""
+    with open(path, 'rb') as f:
+        header = f.readline()
+        data_start = f.tell()
+        sample = [len(line) for line, _ in zip(f, range(1000))]
+        size = f.seek(0, io.SEEK_END)
+
+    step = max(int(sum(sample) / len(sample) * chunk_rows), 1) if sample else 1
+    return header, [(start, min(start + step, size)) for start in range(data_start, size, step)]
+
+def _read_csv_range(path: str, header: bytes, start: int, end: int) -> pd.DataFrame:
+    """
+    Parse the lines of a CSV that start inside [start, end)
+
+    A line straddling ``start`` belongs to the previous range and one
+    straddling ``end`` is read to completion, so adjacent ranges cover every
+    line exactly once. Quoted fields must not contain newlines.
+    """
+    with open(path, 'rb') as f:
+        f.seek(start - 1)
+        if f.read(1) != b'\n':
+            f.readline()
+        body = f.read(max(end - f.tell(), 0))
+        if body and not body.endswith(b'\n'):
+            body += f.readline()
+    return pd.read_csv(io.BytesIO(header + body))
+
+def _reduce_chunk(load: Callable[[], pd.DataFrame]) -> 'PartialStats':
+    """Load and reduce one chunk; module level so process pools can pickle it"""
+    data = load()
+    return PartialStats.from_frame(data) if len(data) else PartialStats()
+
+class PartialStats:
+    """
+    Mergeable aggregates of one chunk of merged energy-weather rows
+
+    Numeric columns keep pairwise-complete moment matrices so that counts,
+    means, standard deviations and Pearson correlations of the full dataset
+    can be recovered exactly after summing the partials of every chunk.
+    Quartiles and demand percentiles come from mergeable t-digests.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.columns: List[str] = []
+        self.missing = pd.Series(dtype=float)
+        self.dtypes: Dict[str, Any] = {}
+        # Pairwise moments: n[i, j] rows with both i and j present,
+        # sx[i, j] / sxx[i, j] sum of x_i / x_i^2 over those rows, sxy[i, j] sum of x_i * x_j
+        self.n = pd.DataFrame()
+        self.sx = pd.DataFrame()
+        self.sxx = pd.DataFrame()
+        self.sxy = pd.DataFrame()
+        self.min = pd.Series(dtype=float)
+        self.max = pd.Series(dtype=float)
+        self.hourly = pd.DataFrame()
+        self.temp_col: Optional[str] = None
+        self.ts_min = None
+        self.ts_max = None
+        self.digests: Dict[str, TDigest] = {}
+        self.sketches = DemandSketches()
+
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame) -> 'PartialStats':
+        """Prepare a raw chunk the same way EnergyWeatherAnalyzer does and aggregate it"""
+        data = EnergyWeatherAnalyzer._prepare_frame(data)
+        partial = cls()
+        partial.rows = len(data)
+        partial.columns = list(data.columns)
+        partial.missing = data.isnull().sum().astype(float)
+        partial.dtypes = {col: data[col].dtype for col in data.columns}
+
+        numeric = data.select_dtypes(include=[np.number])
+        names = list(numeric.columns)
+        x = numeric.to_numpy(dtype=float)
+        present = ~np.isnan(x)
+        mask = present.astype(float)
+        x0 = np.where(present, x, 0.0)
+
+        partial.n = pd.DataFrame(mask.T @ mask, index=names, columns=names)
+        partial.sx = pd.DataFrame(x0.T @ mask, index=names, columns=names)
+        partial.sxx = pd.DataFrame((x0 * x0).T @ mask, index=names, columns=names)
+        partial.sxy = pd.DataFrame(x0.T @ x0, index=names, columns=names)
+        partial.min = numeric.min()
+        partial.max = numeric.max()
+        partial.digests = {name: TDigest().update(x[:, i]) for i, name in enumerate(names)}
+        partial.sketches = DemandSketches().update(data)
+
+        temp_cols = [col for col in data.columns if 'temperature' in col.lower()]
+        partial.temp_col = temp_cols[0] if temp_cols else None
+
+        if 'timestamp' in data.columns and len(data) > 0:
+            timestamps = data['timestamp']
+            partial.ts_min = timestamps.min()
+            partial.ts_max = timestamps.max()
+
+            hours = {'hour': timestamps.dt.hour}
+            if 'value' in data.columns:
+                value = pd.to_numeric(data['value'], errors='coerce')
+                hours.update(value_n=value.notna(), value_sum=value, value_sumsq=value ** 2)
+            if partial.temp_col is not None:
+                temp = pd.to_numeric(data[partial.temp_col], errors='coerce')
+                hours.update(temp_n=temp.notna(), temp_sum=temp)
+            partial.hourly = pd.DataFrame(hours).groupby('hour').sum().astype(float)
+
+        return partial
+
+    @staticmethod
+    def _add(a, b):
+        return a.add(b, fill_value=0).fillna(0)
+
+    def merge(self, other: 'PartialStats') -> 'PartialStats':
+        """Combine two partials into a new one covering both chunks"""
+        merged = PartialStats()
+        merged.rows = self.rows + other.rows
+        merged.columns = self.columns + [col for col in other.columns if col not in self.columns]
+        merged.dtypes = dict(self.dtypes)
+        for col, dtype in other.dtypes.items():
+            merged.dtypes[col] = _common_dtype(merged.dtypes[col], dtype) if col in merged.dtypes else dtype
+
+        # Alignment sorts labels, so restore the original column order afterwards
+        merged.missing = self._add(self.missing, other.missing).reindex(merged.columns, fill_value=0)
+        names = [col for col in merged.columns if col in self.n.columns or col in other.n.columns]
+        for name in ('n', 'sx', 'sxx', 'sxy'):
+            setattr(merged, name, self._add(getattr(self, name), getattr(other, name)).reindex(index=names, columns=names))
+        merged.hourly = self._add(self.hourly, other.hourly)
+        merged.min = pd.concat([self.min, other.min], axis=1).min(axis=1).reindex(names)
+        merged.max = pd.concat([self.max, other.max], axis=1).max(axis=1).reindex(names)
+
+        merged.digests = {name: self.digests[name].merge(other.digests[name])
+                          if name in self.digests and name in other.digests
+                          else (self.digests.get(name) or other.digests[name])
+                          for name in names}
+        merged.sketches = self.sketches.merge(other.sketches)
+
+        merged.temp_col = self.temp_col or other.temp_col
+        merged.ts_min = min((t for t in (self.ts_min, other.ts_min) if t is not None), default=None)
+        merged.ts_max = max((t for t in (self.ts_max, other.ts_max) if t is not None), default=None)
+        return merged
+
+class ChunkedAnalyzer:
+    """
+    Out-of-core counterpart of EnergyWeatherAnalyzer for saved datasets larger than RAM
+
+    The file is split into bounded chunks (Parquet row groups or CSV byte
+    ranges of about ``chunk_rows`` rows). Each worker both reads and reduces
+    its chunk to a PartialStats, and the partials are merged as they complete.
+    At most ``workers`` chunks are in flight at once, so memory stays flat
+    regardless of file size. With ``processes=True`` the workers are separate
+    processes, which sidesteps the GIL for the parsing and reduction.
+    """
+
+    def __init__(self, path: str, chunk_rows: int = 100_000, workers: int = 4,
+                 processes: bool = False):
+        self.path = Path(path)
+        if not self.path.exists():
+            raise FileNotFoundError(f"Data file not found: {self.path}")
+
+        self.chunk_rows = chunk_rows
+        self.workers = workers
+        self.processes = processes
+        self.analysis_results = {}
+        self._partial: Optional[PartialStats] = None
+
+    def _chunk_loaders(self) -> Iterator[Callable[[], pd.DataFrame]]:
+        """Yield picklable zero-argument callables that each load one chunk"""
+        if self.path.suffix.lower() in ('.parquet', '.pq'):
+            try:
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise ImportError("Reading Parquet in chunks requires pyarrow: pip install pyarrow")
+
+            for index in range(pq.ParquetFile(self.path).num_row_groups):
+                yield bind(_read_row_group, str(self.path), index)
+        else:
+            header, ranges = _csv_ranges(str(self.path), self.chunk_rows)
+            for start, end in ranges:
+                yield bind(_read_csv_range, str(self.path), header, start, end)
+
+    def _aggregate(self) -> PartialStats:
+        """Run a single parallel pass over the file and cache the merged partial"""
+        if self._partial is not None:
+            return self._partial
+
+        total = PartialStats()
+        executor = ProcessPoolExecutor if self.processes else ThreadPoolExecutor
+        with executor(max_workers=self.workers) as pool:
+            pending = set()
+            for loader in self._chunk_loaders():
+                pending.add(pool.submit(_reduce_chunk, loader))
+                if len(pending) >= self.workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        total = total.merge(future.result())
+            for future in pending:
+                total = total.merge(future.result())
+
+        print(f"Data aggregated: {total.rows} rows, {len(total.n.columns)} numeric columns")
+        self._partial = total
+        return total
+
+    def _correlations(self, partial: PartialStats) -> pd.DataFrame:
+        """Pairwise-complete Pearson correlations, matching DataFrame.corr()"""
+        n, sx, sxx, sxy = partial.n, partial.sx, partial.sxx, partial.sxy
+        cov = n * sxy - sx * sx.T
+        var_i = n * sxx - sx ** 2
+        var_j = var_i.T
+        denom = np.sqrt((var_i * var_j).where((var_i > 0) & (var_j > 0) & (n > 1)))
+        return (cov / denom).clip(-1, 1)
+
+    def basic_stats(self) -> Dict[str, Any]:
+        """Calculate basic statistics for energy and weather variables"""
+        try:
+            partial = self._aggregate()
+            names = list(partial.n.columns)
+
+            if len(names) == 0:
+                return {'error': 'No numeric columns found for analysis'}
+
+            count = pd.Series(np.diag(partial.n), index=names)
+            total = pd.Series(np.diag(partial.sx), index=names)
+            sumsq = pd.Series(np.diag(partial.sxx), index=names)
+            mean = total / count.where(count > 0)
+            var = (sumsq - total * mean) / (count - 1).where(count > 1)
+
+            quartiles = pd.DataFrame([partial.digests[name].quantile([0.25, 0.5, 0.75]) for name in names],
+                                     index=names, columns=['25%', '50%', '75%'])
+            summary = pd.DataFrame({
+                'count': count,
+                'mean': mean,
+                'std': np.sqrt(var.clip(lower=0)),
+                'min': partial.min.reindex(names),
+                '25%': quartiles['25%'],
+                '50%': quartiles['50%'],
+                '75%': quartiles['75%'],
+                'max': partial.max.reindex(names)
+            }).T
+
+            correlations = self._correlations(partial)
+            stats = {
+                'summary': summary,
+                'correlations': correlations,
+                'energy_weather_corr': self._energy_weather_correlations(partial, correlations)
+            }
+
+            self.analysis_results['basic_stats'] = stats
+            return stats
+
+        except Exception as e:
+            return {'error': f'Error calculating basic stats: {str(e)}'}
+
+    def _energy_weather_correlations(self, partial: PartialStats, correlations: pd.DataFrame) -> Dict[str, float]:
+        """Correlations between energy value and weather variables"""
+        if 'value' not in partial.columns:
+            return {'error': 'No energy value column found'}
+
+        weather_cols = [col for col in partial.columns
+                        if any(w in col.lower() for w in WEATHER_KEYWORDS)]
+
+        result = {}
+        for col in weather_cols:
+            if col in correlations.columns and 'value' in correlations.index:
+                corr = correlations.loc['value', col]
+                if not np.isnan(corr):
+                    result[col] = round(corr, 4)
+
+        return result
+
+    def hourly_patterns(self) -> Dict[str, Any]:
+        """Analyze hourly patterns in energy demand and weather"""
+        try:
+            partial = self._aggregate()
+            if 'timestamp' not in partial.columns:
+                return {'error': 'No timestamp column found'}
+
+            hourly = partial.hourly
+            hourly_stats = {}
+
+            if 'value_n' in hourly.columns:
+                n = hourly['value_n']
+                mean = hourly['value_sum'] / n.where(n > 0)
+                var = (hourly['value_sumsq'] - hourly['value_sum'] * mean) / (n - 1).where(n > 1)
+                energy = pd.DataFrame({
+                    'mean': mean,
+                    'std': np.sqrt(var.clip(lower=0)),
+                    'count': n.astype(int)
+                })
+                energy.index = energy.index.astype(int)
+                energy.index.name = 'hour'
+                hourly_stats['energy_by_hour'] = energy
+
+            if 'temp_n' in hourly.columns:
+                temp = (hourly['temp_sum'] / hourly['temp_n'].where(hourly['temp_n'] > 0)).rename(partial.temp_col)
+                temp.index = temp.index.astype(int)
+                temp.index.name = 'hour'
+                hourly_stats['temp_by_hour'] = temp
+
+            self.analysis_results['hourly_patterns'] = hourly_stats
+            return hourly_stats
+
+        except Exception as e:
+            return {'error': f'Error calculating hourly patterns: {str(e)}'}
+
+    def demand_percentiles(self, by: str = 'all', quantiles=DEFAULT_QUANTILES) -> pd.DataFrame:
+        """Approximate demand percentiles per region, overall or by 'hour', 'month' or 'temp_band'"""
+        return self._aggregate().sketches.percentiles(by, quantiles)
+
+    def hottest_hour_demand(self, temp_quantile: float = 0.95, quantiles=DEFAULT_QUANTILES) -> pd.DataFrame:
+        """Approximate demand percentiles over each region's hottest hours"""
+        return self._aggregate().sketches.hottest_hours(temp_quantile, quantiles)
+
+    def data_quality_check(self) -> Dict[str, Any]:
+        """Check data quality and completeness"""
+        try:
+            partial = self._aggregate()
+        except Exception as e:
+            return {'error': f'Error reading data: {str(e)}'}
+
+        quality_info = {
+            'total_rows': partial.rows,
+            'columns': partial.columns,
+            'missing_data': {},
+            'data_types': {col: str(dtype) for col, dtype in partial.dtypes.items()},
+            'time_range': {}
+        }
+
+        for col in partial.columns:
+            # Round a numpy scalar like the in-memory check does; it breaks ties differently to float
+            missing_count = np.int64(partial.missing.get(col, 0))
+            quality_info['missing_data'][col] = {
+                'count': int(missing_count),
+                'percentage': round((missing_count / partial.rows) * 100, 2) if partial.rows else 0.0
+            }
+
+        if partial.ts_min is not None:
+            quality_info['time_range'] = {
+                'start': str(partial.ts_min),
+                'end': str(partial.ts_max),
+                'duration_hours': (partial.ts_max - partial.ts_min).total_seconds() / 3600
+            }
+
+        return quality_info
@@ -56,6 +56,48 @@ REGIONS = {
     )
 }
 
+@dataclass(frozen=True)
+class EIADataset:
+    """Declarative facet schema for an hourly EIA electricity/rto route
+
+    ``filter_facets`` are pinned per region (each maps to a RegionConfig
+    attribute), while ``series_facets`` vary within a response and become
+    the columns of the pivoted wide frame.
+    """
+    route: str
+    filter_facets: Dict[str, str]
+    series_facets: Tuple[str, ...]
+    prefix: str
+    value_field: str = "value"
+
+# EIA hourly routes, keyed by the short name used throughout the package
+EIA_DATASETS = {
+    "region_sub_ba": EIADataset(
+        route="electricity/rto/region-sub-ba-data",
+        filter_facets={"parent": "parent", "subba": "subba"},
+        series_facets=("subba",),
+        prefix="demand"
+    ),
+    "region": EIADataset(
+        route="electricity/rto/region-data",
+        filter_facets={"respondent": "parent"},
+        series_facets=("type",),
+        prefix="region"
+    ),
+    "fuel_type": EIADataset(
+        route="electricity/rto/fuel-type-data",
+        filter_facets={"respondent": "parent"},
+        series_facets=("fueltype",),
+        prefix="fuel"
+    ),
+    "interchange": EIADataset(
+        route="electricity/rto/interchange-data",
+        filter_facets={"fromba": "parent"},
+        series_facets=("toba",),
+        prefix="interchange"
+    )
+}
+
 def get_date_range(days_back: int = 7) -> Tuple[str, str]:
     """Get date range for data fetching"""
     end = datetime.utcnow()
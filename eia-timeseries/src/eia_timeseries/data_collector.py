@@ -1,8 +1,8 @@
 import pandas as pd
 from typing import Optional, Tuple
-from .eia_client import fetch_eia_region_subba
+from .eia_client import fetch_eia_region_subba, fetch_eia_dataset
 from .weather_client import fetch_weather
-from .config import REGIONS, RegionConfig
+from .config import REGIONS, RegionConfig, EIA_DATASETS
 
 class EnergyWeatherCollector:
     """Collects and correlates energy and weather data for specific regions"""
@@ -62,3 +62,26 @@ class EnergyWeatherCollector:
         merged['region_key'] = self.region_key
         
         return merged
+
+    def collect_series(self, dataset_key: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """Collect an EIA dataset for the region as a wide frame keyed by timestamp"""
+        if dataset_key not in EIA_DATASETS:
+            raise ValueError(f"Dataset '{dataset_key}' not found. Available: {list(EIA_DATASETS.keys())}")
+
+        dataset = EIA_DATASETS[dataset_key]
+        facets = {facet: getattr(self.region, attr) for facet, attr in dataset.filter_facets.items()}
+
+        print(f"Fetching EIA {dataset_key} data...")
+        wide = fetch_eia_dataset(dataset_key, facets, start_date=start_date, end_date=end_date)
+        return wide.to_frame(prefix=dataset.prefix)
+
+    def merge_series(self, merged: pd.DataFrame, *series_frames: pd.DataFrame) -> pd.DataFrame:
+        """Left-join wide EIA series frames onto an already merged dataset"""
+        for frame in series_frames:
+            if frame.empty:
+                continue
+            if 'timestamp' not in frame.columns:
+                raise ValueError("Series frames must have 'timestamp' column")
+            merged = pd.merge(merged, frame, on='timestamp', how='left')
+
+        return merged
@@ -1,21 +1,55 @@
 import requests
+import numpy as np
 import pandas as pd
-from .config import EIA_API_KEY, EIA_BASE_URL, DEFAULT_PARENT, DEFAULT_SUBBA
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from .config import (EIA_API_KEY, EIA_BASE_URL, DEFAULT_PARENT, DEFAULT_SUBBA,
+                     EIA_DATASETS, EIADataset)
 
-def fetch_eia_region_subba(parent=DEFAULT_PARENT, subba=DEFAULT_SUBBA,
-                           start_date=None, end_date=None, length=5000):
-    url = f"{EIA_BASE_URL}/electricity/rto/region-sub-ba-data/data/"
+@dataclass
+class WideSeries:
+    """Hourly EIA series pivoted into a dense (hour x series) float32 array"""
+    hours: pd.DatetimeIndex
+    series: List[str]
+    values: np.ndarray
+
+    def to_frame(self, prefix: str = "") -> pd.DataFrame:
+        """Return a frame with a 'timestamp' column plus one column per series"""
+        columns = [f"{prefix}_{name}" if prefix else name for name in self.series]
+        df = pd.DataFrame(self.values, columns=columns)
+        df.insert(0, "timestamp", self.hours)
+        return df
+
+def fetch_eia_route(route, facets: Optional[Dict[str, str]] = None,
+                    start_date=None, end_date=None, length=5000,
+                    value_field="value"):
+    """
+    Fetch every hourly row of an EIA v2 route, following pagination
+
+    Args:
+        route: Route below the API root, e.g. 'electricity/rto/fuel-type-data'
+        facets: Mapping of facet name to the value to filter on
+        start_date: First hour to request (YYYY-MM-DD)
+        end_date: Last hour to request (YYYY-MM-DD)
+        length: Page size
+        value_field: Data column to request
+    """
+    url = f"{EIA_BASE_URL}/{route}/data/"
     params = {
         "api_key": EIA_API_KEY,
         "frequency": "hourly",
-        "data[0]": "value",
-        "facets[parent][]": parent,
-        "facets[subba][]": subba,
+        "data[0]": value_field,
         "start": start_date,
         "end": end_date,
         "length": length,
-        "offset": 0
+        "offset": 0,
+        # A stable order keeps pagination deterministic across pages
+        "sort[0][column]": "period",
+        "sort[0][direction]": "asc"
     }
+    for facet, value in (facets or {}).items():
+        params[f"facets[{facet}][]"] = value
+
     all_rows = []
     while True:
         resp = requests.get(url, params=params)
@@ -32,3 +66,74 @@ def fetch_eia_region_subba(parent=DEFAULT_PARENT, subba=DEFAULT_SUBBA,
     if not df.empty and "period" in df.columns:
         df["timestamp"] = pd.to_datetime(df["period"], utc=True)
     return df
+
+def fetch_eia_region_subba(parent=DEFAULT_PARENT, subba=DEFAULT_SUBBA,
+                           start_date=None, end_date=None, length=5000):
+    return fetch_eia_route(
+        EIA_DATASETS["region_sub_ba"].route,
+        facets={"parent": parent, "subba": subba},
+        start_date=start_date,
+        end_date=end_date,
+        length=length
+    )
+
+def pivot_eia_wide(df: pd.DataFrame, dataset: EIADataset) -> WideSeries:
+    """
+    Pivot a long EIA response into a dense hour x series array
+
+    Each series facet is factorized separately and the integer codes are
+    combined into one series code, so the values can be scattered straight
+    into a preallocated float32 array. Rows with a missing hour or series
+    facet are dropped. EIA normally returns one row per (hour, series); if a
+    response repeats one, the row that appears last in ``df`` wins, which for
+    fetch_eia_route output means the one from the later page.
+    """
+    if df.empty:
+        return WideSeries(pd.DatetimeIndex([], tz="UTC"), [], np.empty((0, 0), dtype=np.float32))
+
+    timestamps = df["timestamp"] if "timestamp" in df.columns else pd.to_datetime(df["period"], utc=True)
+    keys = ["_hour", *dataset.series_facets]
+    df = df.assign(_hour=timestamps).dropna(subset=keys).drop_duplicates(subset=keys, keep="last")
+    if df.empty:
+        return WideSeries(pd.DatetimeIndex([], tz="UTC"), [], np.empty((0, 0), dtype=np.float32))
+
+    hour_codes, hours = pd.factorize(df["_hour"], sort=True)
+
+    series_codes = np.zeros(len(df), dtype=np.int64)
+    facet_uniques = []
+    for facet in dataset.series_facets:
+        codes, uniques = pd.factorize(df[facet], sort=True)
+        series_codes = series_codes * len(uniques) + codes
+        facet_uniques.append(uniques)
+    present, series_codes = np.unique(series_codes, return_inverse=True)
+
+    # Decode each combined code back into its facet labels
+    labels = [[] for _ in present]
+    remainder = present
+    for uniques in reversed(facet_uniques):
+        remainder, codes = np.divmod(remainder, len(uniques))
+        for label, code in zip(labels, codes):
+            label.insert(0, str(uniques[code]))
+    series = ["_".join(label) for label in labels]
+
+    values = np.full((len(hours), len(series)), np.nan, dtype=np.float32)
+    values[hour_codes, series_codes] = pd.to_numeric(df[dataset.value_field], errors="coerce").to_numpy(dtype=np.float32)
+
+    return WideSeries(pd.DatetimeIndex(hours), series, values)
+
+def fetch_eia_dataset(dataset_key: str, facets: Dict[str, str],
+                      start_date=None, end_date=None, length=5000) -> WideSeries:
+    """Fetch a dataset from EIA_DATASETS and pivot it into a WideSeries"""
+    if dataset_key not in EIA_DATASETS:
+        raise ValueError(f"Dataset '{dataset_key}' not found. Available: {list(EIA_DATASETS.keys())}")
+
+    dataset = EIA_DATASETS[dataset_key]
+    df = fetch_eia_route(
+        dataset.route,
+        facets=facets,
+        start_date=start_date,
+        end_date=end_date,
+        length=length,
+        value_field=dataset.value_field
+    )
+    return pivot_eia_wide(df, dataset)
@@ -0,0 +1,233 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional
+
+# Materialized rollup levels and their pandas period frequency
+ROLLUP_LEVELS = {
+    'daily': 'D',
+    'weekly': 'W',
+    'monthly': 'M'
+}
+
+# Query frequency -> rollup levels whose buckets nest inside it, fewest rows first
+LEVELS_FOR_FREQ = {
+    'D': ['daily'],
+    'W': ['weekly', 'daily'],
+    'M': ['monthly', 'daily'],
+    'Q': ['monthly', 'daily'],
+    'Y': ['monthly', 'daily']
+}
+
+DEFAULT_COLUMNS = ['value', 'temperature_2m', 'relative_humidity_2m',
+                   'wind_speed_10m', 'shortwave_radiation']
+
+def _utc_naive(timestamps: pd.Series) -> pd.Series:
+    """Convert timestamps to naive UTC so they can be bucketed into periods"""
+    timestamps = pd.to_datetime(timestamps)
+    if timestamps.dt.tz is not None:
+        timestamps = timestamps.dt.tz_convert('UTC').dt.tz_localize(None)
+    return timestamps
+
+def _utc_bound(timestamp) -> pd.Timestamp:
+    """Normalize a query bound to naive UTC; naive bounds are taken as UTC"""
+    timestamp = pd.Timestamp(timestamp)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert('UTC').tz_localize(None)
+    return timestamp
+
+def slice_hours(data: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+    """Select hourly rows in [start, end)"""
+    timestamps = _utc_naive(data['timestamp'])
+    mask = np.ones(len(data), dtype=bool)
+    if start is not None:
+        mask &= (timestamps >= _utc_bound(start)).to_numpy()
+    if end is not None:
+        mask &= (timestamps < _utc_bound(end)).to_numpy()
+    return data[mask]
+
+def _agg_map(columns: List[str]) -> Dict[str, str]:
+    """How each sufficient-statistic column combines when buckets are merged"""
+    agg = {}
+    for col in columns:
+        if col.endswith('_min'):
+            agg[col] = 'min'
+        elif col.endswith('_max'):
+            agg[col] = 'max'
+        else:
+            agg[col] = 'sum'
+    return agg
+
+def aggregate_frame(data: pd.DataFrame, freq: str, columns: List[str],
+                    demand_col: str = 'value') -> pd.DataFrame:
+    """
+    Aggregate hourly rows into mergeable sufficient statistics per (region, bucket)
+
+    For every column this keeps count, sum, sum of squares, min and max; for
+    every non-demand column it also keeps the pairwise-complete sums needed to
+    recover its Pearson correlation with demand.
+    """
+    timestamps = _utc_naive(data['timestamp'])
+    keys = {
+        'region_key': data['region_key'].to_numpy() if 'region_key' in data.columns else 'all',
+        'period': timestamps.dt.to_period(freq).dt.start_time.to_numpy()
+    }
+
+    stats = {}
+    for col in columns:
+        x = pd.to_numeric(data[col], errors='coerce').to_numpy(dtype=float)
+        stats[f'{col}_count'] = ~np.isnan(x)
+        stats[f'{col}_sum'] = x
+        stats[f'{col}_sumsq'] = x * x
+        stats[f'{col}_min'] = x
+        stats[f'{col}_max'] = x
+
+    if demand_col in columns:
+        demand = pd.to_numeric(data[demand_col], errors='coerce').to_numpy(dtype=float)
+        for col in columns:
+            if col == demand_col:
+                continue
+            other = pd.to_numeric(data[col], errors='coerce').to_numpy(dtype=float)
+            mask = ~(np.isnan(demand) | np.isnan(other))
+            x = np.where(mask, demand, 0.0)
+            y = np.where(mask, other, 0.0)
+            stats[f'{col}_pair_n'] = mask
+            stats[f'{col}_pair_sx'] = x
+            stats[f'{col}_pair_sy'] = y
+            stats[f'{col}_pair_sxx'] = x * x
+            stats[f'{col}_pair_syy'] = y * y
+            stats[f'{col}_pair_sxy'] = x * y
+
+    frame = pd.DataFrame({**keys, **stats})
+    return frame.groupby(['region_key', 'period']).agg(_agg_map(list(stats)))
+
+def combine_aggregates(*aggregates: pd.DataFrame) -> pd.DataFrame:
+    """Merge aggregate frames that may share (region, bucket) keys"""
+    frames = [agg for agg in aggregates if agg is not None and not agg.empty]
+    if not frames:
+        return pd.DataFrame()
+    combined = pd.concat(frames)
+    return combined.groupby(level=['region_key', 'period']).agg(_agg_map(list(combined.columns)))
+
+def summarize(agg: pd.DataFrame, columns: List[str], demand_col: str = 'value') -> pd.DataFrame:
+    """Turn sufficient statistics into count/sum/mean/std/min/max and demand correlations"""
+    result = {}
+    for col in columns:
+        n = agg[f'{col}_count']
+        total = agg[f'{col}_sum']
+        result[f'{col}_count'] = n.astype(int)
+        result[f'{col}_sum'] = total
+        result[f'{col}_mean'] = total / n.where(n > 0)
+        var = (agg[f'{col}_sumsq'] - total ** 2 / n.where(n > 0)) / (n - 1).where(n > 1)
+        result[f'{col}_std'] = np.sqrt(var.clip(lower=0))
+        result[f'{col}_min'] = agg[f'{col}_min']
+        result[f'{col}_max'] = agg[f'{col}_max']
+
+    for col in columns:
+        if f'{col}_pair_n' not in agg.columns:
+            continue
+        n = agg[f'{col}_pair_n']
+        sx, sy = agg[f'{col}_pair_sx'], agg[f'{col}_pair_sy']
+        cov = n * agg[f'{col}_pair_sxy'] - sx * sy
+        var_x = n * agg[f'{col}_pair_sxx'] - sx ** 2
+        var_y = n * agg[f'{col}_pair_syy'] - sy ** 2
+        denom = np.sqrt((var_x * var_y).where((var_x > 0) & (var_y > 0)))
+        result[f'{col}_corr_{demand_col}'] = cov / denom
+
+    return pd.DataFrame(result, index=agg.index)
+
+def _is_aligned(timestamp, freq: str) -> bool:
+    """Whether a timestamp falls exactly on a bucket boundary of freq"""
+    timestamp = _utc_bound(timestamp)
+    return timestamp == timestamp.to_period(freq).start_time
+
+class RollupStore:
+    """Daily, weekly and monthly rollups of demand and weather, kept up to date incrementally"""
+
+    def __init__(self, columns: Optional[List[str]] = None, demand_col: str = 'value'):
+        self.columns = columns
+        self.demand_col = demand_col
+        self.levels = {level: pd.DataFrame() for level in ROLLUP_LEVELS}
+        self.watermarks = {}
+
+    def update(self, data: pd.DataFrame) -> int:
+        """Fold hours newer than each region's watermark into every rollup level
+
+        Returns the number of hourly rows ingested.
+        """
+        if data.empty or 'timestamp' not in data.columns:
+            return 0
+
+        if self.columns is None:
+            self.columns = [col for col in DEFAULT_COLUMNS if col in data.columns]
+
+        data = data.copy()
+        data['timestamp'] = _utc_naive(data['timestamp'])
+        if 'region_key' not in data.columns:
+            data['region_key'] = 'all'
+        for col in self.columns:
+            if col not in data.columns:
+                data[col] = np.nan
+
+        # Skip hours already folded in so re-ingesting an overlapping window is safe
+        watermark = pd.to_datetime(data['region_key'].map(self.watermarks))
+        data = data[watermark.isna() | (data['timestamp'] > watermark)]
+        if data.empty:
+            return 0
+
+        for level, freq in ROLLUP_LEVELS.items():
+            partial = aggregate_frame(data, freq, self.columns, self.demand_col)
+            self.levels[level] = combine_aggregates(self.levels[level], partial)
+
+        latest = data.groupby('region_key')['timestamp'].max()
+        for region, timestamp in latest.items():
+            self.watermarks[region] = max(timestamp, self.watermarks.get(region, timestamp))
+
+        return len(data)
+
+    def level_for(self, freq: str, start=None, end=None) -> Optional[str]:
+        """Pick the smallest materialized level that exactly covers the query, if any"""
+        if freq not in LEVELS_FOR_FREQ:
+            raise ValueError(f"Frequency '{freq}' not supported. Available: {list(LEVELS_FOR_FREQ.keys())}")
+
+        for level in LEVELS_FOR_FREQ[freq]:
+            level_freq = ROLLUP_LEVELS[level]
+            if self.levels[level].empty:
+                continue
+            if start is not None and not _is_aligned(start, level_freq):
+                continue
+            if end is not None and not _is_aligned(end, level_freq):
+                continue
+            return level
+        return None
+
+    def query(self, freq: str, start=None, end=None) -> Optional[pd.DataFrame]:
+        """
+        Answer a coarse-grained query from the rollups
+
+        Args:
+            freq: Output bucket size: 'D', 'W', 'M', 'Q' or 'Y'
+            start: Inclusive start timestamp (UTC), must be on a bucket boundary
+            end: Exclusive end timestamp (UTC), must be on a bucket boundary
+
+        Returns None when no level can answer without partial buckets, so the
+        caller can fall back to the hourly data.
+        """
+        level = self.level_for(freq, start, end)
+        if level is None:
+            return None
+
+        agg = self.levels[level]
+        periods = agg.index.get_level_values('period')
+        mask = np.ones(len(agg), dtype=bool)
+        if start is not None:
+            mask &= periods >= _utc_bound(start)
+        if end is not None:
+            mask &= periods < _utc_bound(end)
+        agg = agg[mask]
+
+        if ROLLUP_LEVELS[level] != freq:
+            buckets = agg.index.get_level_values('period').to_period(freq).start_time
+            agg = agg.groupby([agg.index.get_level_values('region_key'), buckets]).agg(_agg_map(list(agg.columns)))
+            agg.index.names = ['region_key', 'period']
+
+        return summarize(agg, self.columns, self.demand_col)
@@ -0,0 +1,288 @@
+import json
+import pandas as pd
+import numpy as np
+from typing import Dict, Any, Iterable, Tuple
+
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+
+class TDigest:
+    """
+    Mergeable t-digest quantile sketch
+
+    Values are buffered and periodically compressed into weighted centroids.
+    Compression is vectorized: centroids are sorted, their cumulative weight
+    is mapped through the arcsine scale function, and all centroids falling in
+    the same unit of scale are merged with one reduceat. This keeps clusters
+    small in the tails, which is where P95/P99 estimates need the resolution.
+    """
+
+    def __init__(self, compression: float = 200):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.count = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self._buffer = []
+        self._buffered = 0
+
+    def update(self, values: Iterable[float]) -> 'TDigest':
+        """Add a batch of raw values; NaNs are ignored"""
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+
+        self._buffer.append((values, np.ones(len(values))))
+        self._buffered += len(values)
+        self.count += len(values)
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+
+        if self._buffered > 10 * self.compression:
+            self._compress()
+        return self
+
+    def _compress(self):
+        """Fold buffered values into the centroid list"""
+        if not self._buffer:
+            return
+
+        means = np.concatenate([self.means] + [m for m, _ in self._buffer])
+        weights = np.concatenate([self.weights] + [w for _, w in self._buffer])
+        self._buffer = []
+        self._buffered = 0
+
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        cumulative = np.cumsum(weights)
+        q = (cumulative - weights / 2) / cumulative[-1]
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q - 1)
+        cluster = np.floor(k - k[0]).astype(np.int64)
+
+        starts = np.concatenate([[0], np.flatnonzero(np.diff(cluster)) + 1])
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def merge(self, other: 'TDigest') -> 'TDigest':
+        """Return a new digest summarizing the values of both digests"""
+        merged = TDigest(max(self.compression, other.compression))
+        for digest in (self, other):
+            digest._compress()
+            if digest.count == 0:
+                continue
+            merged._buffer.append((digest.means, digest.weights))
+            merged._buffered += len(digest.means)
+            merged.count += digest.count
+            merged.min = min(merged.min, digest.min)
+            merged.max = max(merged.max, digest.max)
+        merged._compress()
+        return merged
+
+    def quantile(self, qs) -> np.ndarray:
+        """Estimate one or more quantiles in [0, 1]"""
+        self._compress()
+        qs = np.asarray(qs, dtype=float)
+        if self.count == 0:
+            return np.full(qs.shape, np.nan)
+
+        # Each centroid sits at the midpoint of its weight; the extremes are exact
+        positions = np.concatenate([[0], np.cumsum(self.weights) - self.weights / 2, [self.count]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        return np.interp(qs * self.count, positions, values)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable state"""
+        self._compress()
+        return {
+            'compression': self.compression,
+            'means': self.means.tolist(),
+            'weights': self.weights.tolist(),
+            'count': self.count,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> 'TDigest':
+        digest = cls(state['compression'])
+        digest.means = np.asarray(state['means'], dtype=float)
+        digest.weights = np.asarray(state['weights'], dtype=float)
+        digest.count = float(state['count'])
+        if digest.count:
+            digest.min = float(state['min'])
+            digest.max = float(state['max'])
+        return digest
+
+class DemandSketches:
+    """
+    Per-region demand t-digests bucketed by hour of day, month and temperature band
+
+    Every sketch is keyed by (region, dimension, bucket), where dimension is
+    'all', 'hour', 'month' or 'temp_band'. A temperature digest per region
+    locates the hottest hours so their demand distribution can be assembled
+    from the temperature-band sketches without rescanning the data. Like the
+    rollups, each region keeps a watermark of its latest hour so that
+    re-feeding an overlapping window does not count hours twice.
+    """
+
+    DIMENSIONS = ('all', 'hour', 'month', 'temp_band')
+
+    def __init__(self, compression: float = 200, temp_band: float = 1.0,
+                 demand_col: str = 'value', temp_col: str = 'temperature_2m'):
+        self.compression = compression
+        self.temp_band = temp_band
+        self.demand_col = demand_col
+        self.temp_col = temp_col
+        self.digests: Dict[Tuple[str, str, int], TDigest] = {}
+        self.temperature: Dict[str, TDigest] = {}
+        self.watermarks: Dict[str, pd.Timestamp] = {}
+
+    def update(self, data: pd.DataFrame) -> 'DemandSketches':
+        """Stream a batch of hourly rows into the sketches"""
+        if self.demand_col not in data.columns or data.empty:
+            return self
+
+        regions = data['region_key'] if 'region_key' in data.columns else pd.Series('all', index=data.index)
+        if 'timestamp' in data.columns:
+            # Skip hours already sketched so re-feeding an overlapping window is safe
+            timestamps = pd.to_datetime(data['timestamp'], utc=True)
+            watermark = pd.to_datetime(regions.map(self.watermarks), utc=True)
+            fresh = watermark.isna() | (timestamps > watermark)
+            data, regions, timestamps = data[fresh], regions[fresh], timestamps[fresh]
+            if data.empty:
+                return self
+            for region, timestamp in timestamps.groupby(regions).max().items():
+                self.watermarks[region] = max(timestamp, self.watermarks.get(region, timestamp))
+
+        demand = pd.to_numeric(data[self.demand_col], errors='coerce')
+        frame = pd.DataFrame({
+            'region': regions,
+            'demand': demand,
+            'all': 0
+        })
+        if 'timestamp' in data.columns:
+            timestamps = pd.to_datetime(data['timestamp'])
+            frame['hour'] = timestamps.dt.hour
+            frame['month'] = timestamps.dt.month
+        if self.temp_col in data.columns:
+            temp = pd.to_numeric(data[self.temp_col], errors='coerce')
+            frame['temp_band'] = np.floor(temp / self.temp_band)
+            for region, positions in frame.groupby('region').indices.items():
+                self._digest(self.temperature, region).update(temp.to_numpy()[positions])
+
+        frame = frame[frame['demand'].notna()]
+        values = frame['demand'].to_numpy(dtype=float)
+        for dimension in self.DIMENSIONS:
+            if dimension not in frame.columns:
+                continue
+            groups = frame.groupby(['region', dimension]).indices
+            for (region, bucket), positions in groups.items():
+                self._digest(self.digests, (region, dimension, int(bucket))).update(values[positions])
+
+        return self
+
+    def _digest(self, store: Dict, key) -> TDigest:
+        if key not in store:
+            store[key] = TDigest(self.compression)
+        return store[key]
+
+    def merge(self, other: 'DemandSketches') -> 'DemandSketches':
+        """Return new sketches covering the data of both, which should hold disjoint hours"""
+        for attr in ('temp_band', 'demand_col', 'temp_col'):
+            if getattr(self, attr) != getattr(other, attr):
+                raise ValueError(f"Cannot merge sketches with different {attr}: "
+                                 f"{getattr(self, attr)!r} != {getattr(other, attr)!r}")
+        merged = DemandSketches(self.compression, self.temp_band, self.demand_col, self.temp_col)
+        for name in ('digests', 'temperature'):
+            target = getattr(merged, name)
+            for source in (getattr(self, name), getattr(other, name)):
+                for key, digest in source.items():
+                    target[key] = target[key].merge(digest) if key in target else digest.merge(TDigest(digest.compression))
+        for source in (self.watermarks, other.watermarks):
+            for region, timestamp in source.items():
+                merged.watermarks[region] = max(timestamp, merged.watermarks.get(region, timestamp))
+        return merged
+
+    def percentiles(self, by: str = 'all', quantiles=DEFAULT_QUANTILES) -> pd.DataFrame:
+        """
+        Demand percentiles per region, optionally broken down by 'hour', 'month' or 'temp_band'
+
+        Returns a frame indexed by (region, bucket) with one column per quantile.
+        """
+        if by not in self.DIMENSIONS:
+            raise ValueError(f"Dimension '{by}' not supported. Available: {list(self.DIMENSIONS)}")
+
+        keys = sorted(key for key in self.digests if key[1] == by)
+        columns = [f'p{q * 100:g}' for q in quantiles]
+        if not keys:
+            return pd.DataFrame(columns=columns)
+
+        rows = [self.digests[key].quantile(quantiles) for key in keys]
+        index = pd.MultiIndex.from_tuples([(region, bucket) for region, _, bucket in keys],
+                                          names=['region_key', by])
+        return pd.DataFrame(rows, index=index, columns=columns)
+
+    def hottest_hours(self, temp_quantile: float = 0.95, quantiles=DEFAULT_QUANTILES) -> pd.DataFrame:
+        """
+        Demand percentiles over each region's hottest hours
+
+        Hours at or above the region's ``temp_quantile`` temperature are taken
+        from the temperature-band sketches, so the cut-off snaps down to the
+        start of its band of width ``temp_band``. ``band_start`` is the cut-off
+        actually applied and ``share`` the fraction of the region's demand
+        hours it selects, which can exceed ``1 - temp_quantile``.
+        """
+        rows = {}
+        for region, temperature in sorted(self.temperature.items()):
+            if temperature.count == 0:
+                continue
+            threshold = float(temperature.quantile(temp_quantile))
+            first_band = int(np.floor(threshold / self.temp_band))
+            combined = TDigest(self.compression)
+            for (key_region, dimension, band), digest in self.digests.items():
+                if key_region == region and dimension == 'temp_band' and band >= first_band:
+                    combined = combined.merge(digest)
+            total = self.digests.get((region, 'all', 0))
+            share = combined.count / total.count if total is not None and total.count else np.nan
+            rows[region] = ([threshold, first_band * self.temp_band, combined.count, share]
+                            + list(combined.quantile(quantiles)))
+
+        columns = ['temp_threshold', 'band_start', 'hours', 'share'] + [f'p{q * 100:g}' for q in quantiles]
+        result = pd.DataFrame.from_dict(rows, orient='index', columns=columns)
+        result.index.name = 'region_key'
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable state"""
+        return {
+            'compression': self.compression,
+            'temp_band': self.temp_band,
+            'demand_col': self.demand_col,
+            'temp_col': self.temp_col,
+            'digests': {f'{region}|{dimension}|{bucket}': digest.to_dict()
+                        for (region, dimension, bucket), digest in self.digests.items()},
+            'temperature': {region: digest.to_dict() for region, digest in self.temperature.items()},
+            'watermarks': {region: timestamp.isoformat() for region, timestamp in self.watermarks.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> 'DemandSketches':
+        sketches = cls(state['compression'], state['temp_band'], state['demand_col'], state['temp_col'])
+        for key, digest in state['digests'].items():
+            region, dimension, bucket = key.rsplit('|', 2)
+            sketches.digests[(region, dimension, int(bucket))] = TDigest.from_dict(digest)
+        for region, digest in state['temperature'].items():
+            sketches.temperature[region] = TDigest.from_dict(digest)
+        for region, timestamp in state.get('watermarks', {}).items():
+            sketches.watermarks[region] = pd.Timestamp(timestamp)
+        return sketches
+
+    def save(self, path: str):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path: str) -> 'DemandSketches':
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+def make_merged(hours=2000, regions=("ciso_pgae", "pjm_bge"), seed=0):
+    """Synthetic merged energy-weather frame with a V-shaped temperature response"""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i, region in enumerate(regions):
+        temp = np.round(rng.normal(15, 8, hours), 1)
+        value = (1000 + 100 * i + 30 * np.maximum(15 - temp, 0)
+                 + 50 * np.maximum(temp - 15, 0) + rng.normal(0, 10, hours))
+        value[::17] = np.nan
+        humidity = rng.uniform(0, 100, hours)
+        humidity[::23] = np.nan
+        frames.append(pd.DataFrame({
+            'timestamp': pd.date_range('2020-01-01', periods=hours, freq='h', tz='UTC'),
+            'value': value,
+            'temperature_2m': temp,
+            'relative_humidity_2m': humidity,
+            'region_key': region
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+@pytest.fixture
+def merged():
+    return make_merged()
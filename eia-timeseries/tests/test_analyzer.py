@@ -0,0 +1,39 @@
+import numpy as np
+
+from eia_timeseries import EnergyWeatherAnalyzer
+
+def brute_force_change_point(t, y):
+    """Refit the change-point model by least squares at every candidate balance temperature"""
+    order = np.argsort(t, kind='stable')
+    t, y = t[order], y[order]
+    n = len(t)
+    best = None
+    for i in range(max(int(np.floor(0.05 * n)), 1), int(np.ceil(0.95 * n))):
+        if t[i] == t[i - 1]:
+            continue
+        tb = t[i]
+        x = np.column_stack([np.ones(n), np.maximum(tb - t, 0), np.maximum(t - tb, 0)])
+        beta, *_ = np.linalg.lstsq(x, y, rcond=None)
+        sse = np.sum((y - x @ beta) ** 2)
+        if best is None or sse < best[0]:
+            best = (sse, tb, beta)
+    return best
+
+def test_temperature_sensitivity_matches_brute_force(merged):
+    analyzer = EnergyWeatherAnalyzer(merged)
+    results = analyzer.temperature_sensitivity()
+
+    assert set(results) == {'ciso_pgae', 'pjm_bge'}
+    for region, fit in results.items():
+        rows = merged[merged['region_key'] == region].dropna(subset=['value', 'temperature_2m'])
+        _, tb, beta = brute_force_change_point(rows['temperature_2m'].to_numpy(), rows['value'].to_numpy())
+
+        assert fit['balance_temp'] == round(tb, 2)
+        assert np.allclose([fit['base_load'], fit['heating_slope'], fit['cooling_slope']],
+                           np.round(beta, 2), atol=0.011)
+        assert abs(fit['heating_slope'] - 30) < 1
+        assert abs(fit['cooling_slope'] - 50) < 1
+
+def test_temperature_sensitivity_requires_columns(merged):
+    analyzer = EnergyWeatherAnalyzer(merged.drop(columns=['temperature_2m']))
+    assert 'error' in analyzer.temperature_sensitivity()
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from eia_timeseries import ChunkedAnalyzer, EnergyWeatherAnalyzer
+from eia_timeseries.chunked import _csv_ranges, _read_csv_range
+
+@pytest.fixture
+def saved(merged, tmp_path):
+    path = tmp_path / 'merged.csv'
+    merged.to_csv(path, index=False)
+    return path
+
+@pytest.mark.parametrize('processes', [False, True])
+def test_chunked_matches_in_memory(saved, processes):
+    analyzer = EnergyWeatherAnalyzer(pd.read_csv(saved))
+    chunked = ChunkedAnalyzer(saved, chunk_rows=333, workers=3, processes=processes)
+
+    # Checked first: hourly_patterns adds an 'hour' column to the in-memory frame
+    assert chunked.data_quality_check() == analyzer.data_quality_check()
+
+    expected, result = analyzer.basic_stats(), chunked.basic_stats()
+    exact_rows = ['count', 'mean', 'std', 'min', 'max']
+    assert np.allclose(result['summary'].loc[exact_rows], expected['summary'].loc[exact_rows])
+    assert np.allclose(result['summary'].loc[['25%', '50%', '75%']],
+                       expected['summary'].loc[['25%', '50%', '75%']], rtol=0.01)
+    assert np.allclose(result['correlations'], expected['correlations'])
+    assert result['energy_weather_corr'] == expected['energy_weather_corr']
+
+    expected_hourly, result_hourly = analyzer.hourly_patterns(), chunked.hourly_patterns()
+    assert np.allclose(result_hourly['energy_by_hour'], expected_hourly['energy_by_hour'])
+    assert np.allclose(result_hourly['temp_by_hour'], expected_hourly['temp_by_hour'])
+
+def test_chunked_read_error_is_reported(tmp_path):
+    path = tmp_path / 'broken.csv'
+    path.write_text('timestamp,value\n2020-01-01T00:00Z,1\n"unterminated,2\n')
+    chunked = ChunkedAnalyzer(path)
+
+    assert 'error' in chunked.basic_stats()
+    assert 'error' in chunked.hourly_patterns()
+    assert 'error' in chunked.data_quality_check()
+
+def test_chunked_dtypes_promote_like_a_single_read(merged, tmp_path):
+    data = merged.assign(value=np.arange(len(merged)))
+    data['value'] = data['value'].astype(float)
+    data.loc[900, 'value'] = np.nan
+    path = tmp_path / 'gap.csv'
+    data.to_csv(path, index=False, float_format='%.10g')
+
+    chunked = ChunkedAnalyzer(path, chunk_rows=200)
+    expected = EnergyWeatherAnalyzer(pd.read_csv(path)).data_quality_check()
+    assert chunked.data_quality_check() == expected
+    assert expected['data_types']['value'] == 'float64'
+
+@pytest.mark.parametrize('chunk_rows', [7, 10_000])
+def test_csv_ranges_cover_every_line_once(saved, chunk_rows):
+    header, ranges = _csv_ranges(str(saved), chunk_rows)
+    chunks = [_read_csv_range(str(saved), header, start, end) for start, end in ranges]
+
+    # Ranges narrower than a line come back empty and are skipped by the reducer
+    chunks = [chunk for chunk in chunks if len(chunk)]
+    assert pd.concat(chunks, ignore_index=True).equals(pd.read_csv(saved))
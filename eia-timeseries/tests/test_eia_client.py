@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+
+from eia_timeseries import eia_client
+from eia_timeseries.config import EIA_DATASETS, EIADataset
+from eia_timeseries.eia_client import fetch_eia_route, pivot_eia_wide
+
+FUEL = EIA_DATASETS["fuel_type"]
+TWO_FACETS = EIADataset(route="electricity/rto/test", filter_facets={},
+                        series_facets=("toba", "fueltype"), prefix="x")
+
+def test_pivot_two_facets_decodes_labels_in_order():
+    df = pd.DataFrame({
+        "period": ["2024-01-01T00", "2024-01-01T00", "2024-01-01T01", "2024-01-01T01"],
+        "toba": ["Y", "X", "X", "Y"],
+        "fueltype": ["2", "1", "2", "1"],
+        "value": ["4", "1", "2", "3"]
+    })
+    wide = pivot_eia_wide(df, TWO_FACETS)
+
+    assert wide.series == ["X_1", "X_2", "Y_1", "Y_2"]
+    expected = np.array([[1, np.nan, np.nan, 4], [np.nan, 2, 3, np.nan]], dtype=np.float32)
+    assert np.array_equal(wide.values, expected, equal_nan=True)
+    assert wide.values.dtype == np.float32
+
+    frame = wide.to_frame(prefix="x")
+    assert list(frame.columns) == ["timestamp", "x_X_1", "x_X_2", "x_Y_1", "x_Y_2"]
+    assert frame["timestamp"].tolist() == list(pd.to_datetime(["2024-01-01T00", "2024-01-01T01"], utc=True))
+
+def test_pivot_drops_null_facets_and_periods():
+    df = pd.DataFrame({
+        "period": ["2024-01-01T00", "2024-01-01T00", None, "2024-01-01T01"],
+        "fueltype": ["SUN", None, "COL", "COL"],
+        "value": [1, 2, 3, 4]
+    })
+    wide = pivot_eia_wide(df, FUEL)
+
+    assert wide.series == ["COL", "SUN"]
+    assert np.array_equal(wide.values, np.array([[np.nan, 1], [4, np.nan]], dtype=np.float32), equal_nan=True)
+
+def test_pivot_duplicate_rows_keep_last():
+    df = pd.DataFrame({
+        "period": ["2024-01-01T00", "2024-01-01T00", "2024-01-01T00"],
+        "fueltype": ["NG", "NG", "NG"],
+        "value": [1, 2, 3]
+    })
+    assert pivot_eia_wide(df, FUEL).values.tolist() == [[3.0]]
+
+def test_pivot_coerces_non_numeric_values():
+    df = pd.DataFrame({
+        "period": ["2024-01-01T00", "2024-01-01T00"],
+        "fueltype": ["NG", "SUN"],
+        "value": ["12.5", "n/a"]
+    })
+    values = pivot_eia_wide(df, FUEL).values
+    assert values[0, 0] == 12.5
+    assert np.isnan(values[0, 1])
+
+def test_pivot_empty_response():
+    wide = pivot_eia_wide(pd.DataFrame([]), FUEL)
+
+    assert wide.series == []
+    assert wide.values.shape == (0, 0)
+    assert list(wide.to_frame(prefix="fuel").columns) == ["timestamp"]
+
+class FakeResponse:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"response": {"data": self.rows}}
+
+def test_fetch_route_paginates_with_facets(monkeypatch):
+    pages = [
+        [{"period": "2024-01-01T00", "fueltype": "NG", "value": "1"},
+         {"period": "2024-01-01T01", "fueltype": "NG", "value": "2"}],
+        [{"period": "2024-01-01T02", "fueltype": "NG", "value": "3"}]
+    ]
+    calls = []
+
+    def fake_get(url, params):
+        calls.append((url, dict(params)))
+        return FakeResponse(pages[len(calls) - 1])
+
+    monkeypatch.setattr(eia_client.requests, "get", fake_get)
+    df = fetch_eia_route(FUEL.route, facets={"respondent": "CISO"}, start_date="2024-01-01", length=2)
+
+    assert len(df) == 3
+    assert df["timestamp"].dt.tz is not None
+    assert [params["offset"] for _, params in calls] == [0, 2]
+    url, params = calls[0]
+    assert url.endswith("/electricity/rto/fuel-type-data/data/")
+    assert params["facets[respondent][]"] == "CISO"
+    assert params["sort[0][column]"] == "period"
+    assert params["data[0]"] == "value"
+
+def test_fetch_route_stops_on_empty_page(monkeypatch):
+    monkeypatch.setattr(eia_client.requests, "get", lambda url, params: FakeResponse([]))
+    assert fetch_eia_route(FUEL.route).empty
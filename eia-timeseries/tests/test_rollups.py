@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+from eia_timeseries import EnergyWeatherAnalyzer
+from eia_timeseries.rollups import RollupStore
+
+def hourly_monthly(data):
+    """Reference monthly aggregation straight from the hourly rows"""
+    data = data.assign(period=data['timestamp'].dt.tz_localize(None).dt.to_period('M').dt.start_time)
+    grouped = data.groupby(['region_key', 'period'])
+    expected = grouped['value'].agg(['count', 'sum', 'mean', 'std', 'min', 'max'])
+    expected['corr'] = grouped[['value', 'temperature_2m']].apply(
+        lambda g: g['value'].corr(g['temperature_2m']))
+    return expected
+
+def test_rollup_matches_hourly_aggregation(merged):
+    analyzer = EnergyWeatherAnalyzer(merged)
+    result = analyzer.rollup('M')
+
+    assert analyzer.rollups.level_for('M') == 'monthly'
+    expected = hourly_monthly(merged)
+    for stat in ('count', 'sum', 'mean', 'std', 'min', 'max'):
+        assert np.allclose(result[f'value_{stat}'], expected[stat])
+    assert np.allclose(result['temperature_2m_corr_value'], expected['corr'])
+
+def test_coarser_query_reaggregates_rollup(merged):
+    analyzer = EnergyWeatherAnalyzer(merged)
+    result = analyzer.rollup('Q')
+    raw_counts = merged.groupby('region_key')['value'].count()
+
+    assert analyzer.rollups.level_for('Q') == 'monthly'
+    assert (result['value_count'].groupby(level='region_key').sum() == raw_counts).all()
+
+def test_overlapping_ingest_keeps_rollups_and_hourly_data_consistent(merged):
+    cutoff = pd.Timestamp('2020-02-01', tz='UTC')
+    analyzer = EnergyWeatherAnalyzer(merged[merged['timestamp'] < cutoff])
+    analyzer.rollup('M')
+
+    overlap = merged[merged['timestamp'] >= cutoff - pd.Timedelta(hours=100)]
+    accepted = analyzer.ingest(overlap)
+
+    assert accepted == (merged['timestamp'] >= cutoff).sum()
+    assert len(analyzer.data) == len(merged)
+    assert analyzer.rollup('M')['value_count'].sum() == merged['value'].count()
+
+    # Unaligned queries fall back to the hourly rows and must agree with them
+    start = '2020-02-01 05:00'
+    unaligned = analyzer.rollup('M', start)
+    assert unaligned['value_count'].sum() == merged.loc[merged['timestamp'] >= pd.Timestamp(start, tz='UTC'), 'value'].count()
+
+def test_injected_store_is_brought_up_to_date(merged):
+    empty = EnergyWeatherAnalyzer(merged, rollups=RollupStore())
+    assert empty.rollup('M')['value_count'].sum() == merged['value'].count()
+
+    january = merged[merged['timestamp'] < pd.Timestamp('2020-02-01', tz='UTC')]
+    store = RollupStore()
+    store.update(january)
+    analyzer = EnergyWeatherAnalyzer(merged, rollups=store)
+    assert analyzer.rollup('M')['value_count'].sum() == merged['value'].count()
+
+def test_fallback_without_materialized_rollups(merged):
+    analyzer = EnergyWeatherAnalyzer(merged.iloc[:0], rollups=RollupStore())
+    assert analyzer.rollup('M', '2020-01-01 05:00').empty
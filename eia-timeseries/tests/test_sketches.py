@@ -0,0 +1,80 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from eia_timeseries import EnergyWeatherAnalyzer
+from eia_timeseries.sketches import DemandSketches, TDigest
+
+QUANTILES = [0.05, 0.25, 0.5, 0.75, 0.95, 0.99]
+
+def test_tdigest_quantiles_are_close_to_exact():
+    values = np.random.default_rng(1).lognormal(7, 0.4, 100_000)
+    digest = TDigest()
+    for batch in np.array_split(values, 50):
+        digest.update(batch)
+
+    assert digest.count == len(values)
+    assert np.allclose(digest.quantile(QUANTILES), np.quantile(values, QUANTILES), rtol=0.01)
+    assert digest.quantile(0) == values.min()
+    assert digest.quantile(1) == values.max()
+
+def test_tdigest_merge_matches_single_digest():
+    values = np.random.default_rng(2).normal(1000, 100, 60_000)
+    parts = [TDigest().update(part) for part in np.array_split(values, 3)]
+    merged = parts[0].merge(parts[1]).merge(parts[2])
+    single = TDigest().update(values)
+
+    assert merged.count == single.count
+    assert merged.min == single.min and merged.max == single.max
+    assert np.allclose(merged.quantile(QUANTILES), single.quantile(QUANTILES), rtol=0.005)
+
+def test_tdigest_serialization_round_trip():
+    digest = TDigest().update(np.random.default_rng(3).normal(0, 1, 10_000))
+    restored = TDigest.from_dict(json.loads(json.dumps(digest.to_dict())))
+
+    assert restored.count == digest.count
+    assert np.array_equal(restored.quantile(QUANTILES), digest.quantile(QUANTILES))
+    assert np.isnan(TDigest.from_dict(TDigest().to_dict()).quantile(0.5))
+
+def test_demand_sketches_merge_and_round_trip(merged, tmp_path):
+    half = len(merged) // 2
+    first = DemandSketches().update(merged.iloc[:half])
+    second = DemandSketches().update(merged.iloc[half:])
+
+    path = tmp_path / 'sketches.json'
+    first.save(path)
+    combined = DemandSketches.load(path).merge(second)
+    single = DemandSketches().update(merged)
+
+    for by in ('all', 'hour', 'month'):
+        assert np.allclose(combined.percentiles(by), single.percentiles(by), rtol=0.005)
+
+    exact = merged.groupby('region_key')['value'].quantile(0.95)
+    overall = combined.percentiles()['p95'].droplevel('all')
+    assert np.allclose(overall, exact, rtol=0.01)
+
+    hottest = combined.hottest_hours(0.95)
+    assert (hottest['share'] >= 0.05 - 1e-9).all()
+
+def test_injected_sketches_are_brought_up_to_date(merged):
+    january = merged[merged['timestamp'] < pd.Timestamp('2020-02-01', tz='UTC')]
+    restored = DemandSketches.from_dict(json.loads(json.dumps(DemandSketches().update(january).to_dict())))
+    analyzer = EnergyWeatherAnalyzer(merged, sketches=restored)
+
+    single = DemandSketches().update(merged)
+    assert analyzer.sketches.digests[('pjm_bge', 'all', 0)].count == merged.loc[merged['region_key'] == 'pjm_bge', 'value'].count()
+    assert np.allclose(analyzer.demand_percentiles('month'), single.percentiles('month'), rtol=0.005)
+
+    # Re-feeding hours already sketched leaves the counts unchanged
+    analyzer.ingest(merged.tail(100))
+    assert analyzer.sketches.digests[('pjm_bge', 'all', 0)].count == merged.loc[merged['region_key'] == 'pjm_bge', 'value'].count()
+
+def test_demand_sketches_merge_rejects_mismatched_settings():
+    with pytest.raises(ValueError, match='temp_band'):
+        DemandSketches(temp_band=1.0).merge(DemandSketches(temp_band=2.0))
+    with pytest.raises(ValueError, match='demand_col'):
+        DemandSketches().merge(DemandSketches(demand_col='load'))
+    with pytest.raises(ValueError, match='temp_col'):
+        DemandSketches().merge(DemandSketches(temp_col='apparent_temperature'))